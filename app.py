@@ -5,111 +5,24 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import pandas as pd
 import plotly.express as px
-import re
+import pyarrow as pa
+import pyarrow.compute as pc
 import random
 import numpy as np
-
-# ==================== MOCK AI MODEL ====================
-class MockFakeNewsDetector:
-    def __init__(self):
-        self.fake_indicators = {
-            'emotional': ['miracle', 'shocking', 'amazing', 'unbelievable', 'breakthrough',
-                         'secret', 'hidden truth', 'they dont want you to know', 'astounding',
-                         'incredible', 'mind-blowing', 'earth-shattering'],
-            'urgency': ['urgent', 'immediately', 'act now', 'breaking', 'last chance',
-                       'limited time', 'don\'t wait', 'instant', 'quick', 'fast'],
-            'conspiracy': ['big pharma', 'cover-up', 'mainstream media', 'government hiding',
-                          'deep state', 'elites', 'suppressed', 'censored', 'they\'re lying'],
-            'sensational': ['you won\'t believe', 'what happened next', 'the truth about',
-                           'exposed', 'revealed', 'secret method', 'doctors hate this']
-        }
-        
-        self.credible_indicators = [
-            'according to', 'study', 'research', 'university', 'official',
-            'confirmed', 'experts say', 'peer-reviewed', 'scientists', 'data shows',
-            'clinical trial', 'journal', 'published', 'report', 'findings'
-        ]
-
-    def analyze_text(self, headline, text):
-        """Mock analysis that simulates real AI behavior"""
-        content = f"{headline} {text}".lower()
-        
-        # Analyze fake indicators
-        fake_score = 0
-        details = {'emotional': 0, 'urgency': 0, 'conspiracy': 0, 'sensational': 0}
-        found_words = {'emotional': [], 'urgency': [], 'conspiracy': [], 'sensational': []}
-        
-        for category, words in self.fake_indicators.items():
-            for word in words:
-                if word in content:
-                    details[category] += 1
-                    found_words[category].append(word)
-                    fake_score += 2 if category == 'conspiracy' else 1
-        
-        # Analyze credible indicators
-        credible_score = 0
-        credible_found = []
-        for indicator in self.credible_indicators:
-            count = content.count(indicator)
-            credible_score += count * 2
-            if count > 0:
-                credible_found.append(indicator)
-        
-        # Text structure analysis
-        exclamation_count = content.count('!')
-        question_count = content.count('?')
-        all_caps = len(re.findall(r'\b[A-Z]{4,}\b', f"{headline} {text}"))
-        
-        # Add structure penalties
-        fake_score += exclamation_count * 0.5
-        fake_score += question_count * 0.3
-        fake_score += all_caps * 1
-        
-        # Length factor (very short texts are suspicious)
-        length_factor = max(0.1, min(1.0, len(text) / 500))
-        
-        # Calculate final scores
-        base_fake_score = min(fake_score, 25) / 25
-        base_credible_score = min(credible_score, 20) / 20
-        
-        # Add small random variation for demo purposes
-        random_variation = random.uniform(-0.1, 0.1)
-        final_score = max(0, min(1, base_fake_score - (base_credible_score * 0.6) + random_variation))
-        
-        # Determine verdict
-        if final_score > 0.7:
-            verdict = "🔴 HIGH RISK - LIKELY FAKE"
-            confidence = final_score
-            color = "fake"
-        elif final_score > 0.4:
-            verdict = "🟡 MEDIUM RISK - SUSPICIOUS"
-            confidence = 0.5
-            color = "suspicious"
-        else:
-            verdict = "🟢 LOW RISK - LIKELY REAL"
-            confidence = 1 - final_score
-            color = "real"
-        
-        return {
-            'verdict': verdict,
-            'confidence': round(confidence * 100, 1),
-            'score': round(final_score, 3),
-            'details': details,
-            'found_words': found_words,
-            'credible_indicators': credible_found,
-            'text_metrics': {
-                'exclamation_marks': exclamation_count,
-                'question_marks': question_count,
-                'all_caps_words': all_caps,
-                'text_length': len(text),
-                'length_factor': round(length_factor, 2)
-            },
-            'component_scores': {
-                'fake_indicators_score': round(base_fake_score * 100, 1),
-                'credible_indicators_score': round(base_credible_score * 100, 1),
-                'structure_penalty': exclamation_count + all_caps
-            }
-        }
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import uuid
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from detector import MockFakeNewsDetector
+from batch import load_result_columns, result_files
 
 # Initialize detector
 detector = MockFakeNewsDetector()
@@ -225,10 +138,22 @@ def initialize_session_state():
         st.session_state.analysis_history = []
     if 'current_result' not in st.session_state:
         st.session_state.current_result = None
+    if 'bulk_job' not in st.session_state:
+        st.session_state.bulk_job = None
+    if 'bulk_download_ready' not in st.session_state:
+        st.session_state.bulk_download_ready = False
+    if 'url_job' not in st.session_state:
+        st.session_state.url_job = None
+    if 'url_fetched' not in st.session_state:
+        st.session_state.url_fetched = None
 
 # ==================== UTILITY FUNCTIONS ====================
 def extract_article_from_url(url):
-    """Mock URL content extraction - can be enhanced with real scraping"""
+    """Mock URL content extraction - can be enhanced with real scraping
+
+    Returns (headline, article_text, error). Runs on background workers, so
+    failures are reported through ``error`` instead of drawing on the page.
+    """
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
         response = requests.get(url, headers=headers, timeout=10)
@@ -242,18 +167,17 @@ def extract_article_from_url(url):
         paragraphs = soup.find_all('p')
         article_text = ' '.join([p.get_text().strip() for p in paragraphs[:8]])
         
-        return headline_text, article_text[:2000]  # Limit text length
+        return headline_text, article_text[:2000], None  # Limit text length
     
     except Exception as e:
         # Return mock data if extraction fails
-        st.warning(f"⚠️ Could not extract content from URL. Using demo content. Error: {str(e)}")
         mock_headlines = [
             "Breaking News: Major Development in Technology Sector",
             "Scientific Discovery Could Change Everything We Know",
             "Important Update Regarding Recent Events"
         ]
         mock_text = "This is a sample article text extracted from the provided URL. The content appears to be legitimate news reporting with balanced language and factual presentation."
-        return random.choice(mock_headlines), mock_text
+        return random.choice(mock_headlines), mock_text, str(e)
 
 def save_to_history(headline, result):
     """Save analysis results to session history"""
@@ -280,10 +204,11 @@ def perform_analysis(headline, article_text):
             progress_bar.progress(i + 1)
         
         try:
-            result = detector.analyze_text(headline, article_text)
-            st.session_state.current_result = result
-            save_to_history(headline, result)
-            display_results(result, headline)
+            with profile_block("analysis"):
+                result = detector.analyze_text(headline, article_text)
+                st.session_state.current_result = result
+                save_to_history(headline, result)
+                display_results(result, headline)
             
         except Exception as e:
             st.error(f"❌ Analysis failed: {str(e)}")
@@ -417,6 +342,695 @@ def display_results(result, headline):
             - 🌐 Check the website's about page and mission
             """)
 
+# ==================== BULK ANALYSIS ====================
+BULK_CHUNK_SIZE = 1000      # Rows scored per chunk; bounds worker memory
+BULK_PREVIEW_ROWS = 200     # Most recent results kept in memory for the page
+BULK_POLL_SECONDS = 1.0     # How often the page refreshes while a job runs
+BULK_JOB_TTL_SECONDS = 3600 # Jobs (and temp files) of sessions gone this long are removed
+BULK_SWEEP_SECONDS = 60     # Minimum interval between sweeps
+BULK_TEMP_DIR_PREFIX = "fake_news_bulk_"
+BULK_HEADLINE_PREVIEW_CHARS = 80
+
+BULK_RESULT_COLUMNS = [
+    'row', 'id', 'headline', 'verdict', 'confidence', 'score',
+    'emotional', 'urgency', 'conspiracy', 'sensational', 'credible_indicators',
+    'exclamation_marks', 'question_marks', 'all_caps_words', 'text_length'
+]
+
+def bulk_temp_dir(pid=None):
+    """Temp directory owned by one server process, so sweeps never touch another's files"""
+    path = os.path.join(tempfile.gettempdir(), f"{BULK_TEMP_DIR_PREFIX}{pid or os.getpid()}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def flatten_result(row_number, record_id, headline, result):
+    """Flatten an analyze_text result into a single tabular row"""
+    metrics = result['text_metrics']
+    return {
+        'row': row_number,
+        'id': record_id,
+        'headline': headline,
+        'verdict': result['verdict'],
+        'confidence': result['confidence'],
+        'score': result['score'],
+        **result['details'],
+        'credible_indicators': len(result['credible_indicators']),
+        'exclamation_marks': metrics['exclamation_marks'],
+        'question_marks': metrics['question_marks'],
+        'all_caps_words': metrics['all_caps_words'],
+        'text_length': metrics['text_length']
+    }
+
+def iter_article_chunks(handle, file_format, chunk_size=BULK_CHUNK_SIZE):
+    """Yield ([(row, id, headline, text), ...], skipped) chunks from an open binary CSV/JSONL file
+
+    ``row`` is the 1-based data row (CSV) or line number (JSONL) in the upload,
+    so results can be joined back even when records are skipped. Every record
+    needs a ``text`` field and may have ``id`` and ``headline``. A CSV without
+    a ``text`` column is rejected outright; JSONL lines that are not valid
+    JSON objects with a ``text`` key are skipped and counted.
+    """
+    if file_format == 'csv':
+        reader = pd.read_csv(handle, chunksize=chunk_size, dtype=str, keep_default_na=False)
+        for chunk in reader:
+            if 'text' not in chunk.columns:
+                raise ValueError("CSV must contain a 'text' column (and optionally 'id', 'headline')")
+            blank = [''] * len(chunk)
+            ids = chunk['id'] if 'id' in chunk.columns else blank
+            headlines = chunk['headline'] if 'headline' in chunk.columns else blank
+            # Chunk indexes continue across chunks, so index + 1 is the data row
+            yield list(zip(chunk.index + 1, ids, headlines, chunk['text'])), 0
+    else:
+        batch = []
+        skipped = 0
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict) or record.get('text') is None:
+                skipped += 1
+                continue
+            record_id = record.get('id')
+            batch.append((line_number, '' if record_id is None else str(record_id),
+                          str(record.get('headline') or ''), str(record['text'])))
+            if len(batch) >= chunk_size:
+                yield batch, skipped
+                batch = []
+                skipped = 0
+        if batch or skipped:
+            yield batch, skipped
+
+class BulkScoringJob:
+    """Scores an uploaded file on a background thread, streaming results to disk"""
+
+    def __init__(self, input_path, file_format):
+        self.input_path = input_path
+        self.file_format = file_format
+        self.total_bytes = os.path.getsize(input_path)
+        fd, self.output_path = tempfile.mkstemp(prefix="bulk_results_", suffix=".csv", dir=bulk_temp_dir())
+        os.close(fd)
+
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self.rows_done = 0
+        self.rows_skipped = 0
+        self.bytes_done = 0
+        self.verdict_counts = {}
+        self.preview = deque(maxlen=BULK_PREVIEW_ROWS)
+        self.status = "running"
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.removed = False
+
+        self._thread = threading.Thread(target=self._run, name="bulk-scoring", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def clear_preview(self):
+        with self._lock:
+            self.preview.clear()
+
+    def _run(self):
+        # The worker has its own detector so it never shares state with the UI thread
+        worker_detector = MockFakeNewsDetector()
+        try:
+            with open(self.input_path, 'rb') as source, \
+                    open(self.output_path, 'w', newline='', encoding='utf-8') as sink:
+                header_written = False
+                for chunk, skipped in iter_article_chunks(source, self.file_format):
+                    if self._cancel.is_set():
+                        break
+                    rows = []
+                    for row_number, record_id, headline, text in chunk:
+                        result = worker_detector.analyze_text(headline, text)
+                        rows.append(flatten_result(int(row_number), record_id, headline, result))
+
+                    pd.DataFrame(rows, columns=BULK_RESULT_COLUMNS).to_csv(
+                        sink, header=not header_written, index=False
+                    )
+                    header_written = True
+
+                    with self._lock:
+                        self.rows_done += len(rows)
+                        self.rows_skipped += skipped
+                        self.bytes_done = min(source.tell(), self.total_bytes)
+                        for row in rows:
+                            self.verdict_counts[row['verdict']] = self.verdict_counts.get(row['verdict'], 0) + 1
+                        self.preview.extend(rows)
+
+                if not header_written:
+                    sink.write(','.join(BULK_RESULT_COLUMNS) + '\n')
+
+            with self._lock:
+                if self._cancel.is_set():
+                    self.status = "cancelled"
+                elif self.rows_done == 0 and self.rows_skipped > 0:
+                    self.status = "failed"
+                    self.error = "No valid records - every line was malformed or missing a 'text' field"
+                else:
+                    self.status = "done"
+        except Exception as e:
+            with self._lock:
+                self.status = "failed"
+                self.error = str(e)
+        finally:
+            with self._lock:
+                self.finished_at = time.time()
+
+    def snapshot(self):
+        """Return a consistent copy of the job's progress for rendering"""
+        with self._lock:
+            progress = 1.0 if self.status == "done" else (
+                self.bytes_done / self.total_bytes if self.total_bytes else 0.0
+            )
+            return {
+                'status': self.status,
+                'error': self.error,
+                'rows_done': self.rows_done,
+                'rows_skipped': self.rows_skipped,
+                'progress': min(progress, 1.0),
+                'verdict_counts': dict(self.verdict_counts),
+                'preview': list(self.preview),
+                'elapsed': (self.finished_at or time.time()) - self.started_at
+            }
+
+    def cleanup(self):
+        """Stop the worker and remove its temporary files"""
+        self.cancel()
+        self._thread.join(timeout=5)
+        self.removed = True
+        for path in (self.input_path, self.output_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def start_bulk_job(uploaded_file):
+    """Copy an upload to disk and start scoring it in the background"""
+    file_format = 'csv' if uploaded_file.name.lower().endswith('.csv') else 'jsonl'
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    fd, input_path = tempfile.mkstemp(prefix="bulk_upload_", suffix=suffix, dir=bulk_temp_dir())
+    with os.fdopen(fd, 'wb') as target:
+        uploaded_file.seek(0)
+        while True:
+            block = uploaded_file.read(1024 * 1024)
+            if not block:
+                break
+            target.write(block)
+
+    registry = get_bulk_job_registry()
+    previous_job = st.session_state.get('bulk_job')
+    if previous_job is not None:
+        registry.forget(previous_job)
+        previous_job.cleanup()
+
+    st.session_state.bulk_job = BulkScoringJob(input_path, file_format).start()
+    st.session_state.bulk_download_ready = False
+    registry.touch(st.session_state.bulk_job)
+
+class BulkJobRegistry:
+    """Tracks every session's bulk job so abandoned ones don't leave temp files behind
+
+    Sessions have no reliable end hook, so jobs whose session hasn't rerun for
+    BULK_JOB_TTL_SECONDS are cancelled and their files removed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_seen = {}    # BulkScoringJob -> last time its session ran
+        self._last_sweep = 0.0
+
+    def touch(self, job):
+        with self._lock:
+            self._last_seen[job] = time.time()
+
+    def forget(self, job):
+        with self._lock:
+            self._last_seen.pop(job, None)
+
+    def clear_previews(self):
+        """Drop the in-memory preview rows of every tracked job"""
+        with self._lock:
+            jobs = list(self._last_seen)
+        for job in jobs:
+            job.clear_preview()
+
+    def sweep(self, force=False):
+        """Remove expired jobs, stray files in this process's temp dir, and dead processes' dirs"""
+        now = time.time()
+        cutoff = now - BULK_JOB_TTL_SECONDS
+        with self._lock:
+            if not force and now - self._last_sweep < BULK_SWEEP_SECONDS:
+                return
+            self._last_sweep = now
+            expired = [job for job, seen in self._last_seen.items() if seen < cutoff]
+            for job in expired:
+                del self._last_seen[job]
+            live_paths = {path for job in self._last_seen for path in (job.input_path, job.output_path)}
+
+        for job in expired:
+            job.cleanup()
+
+        own_dir = bulk_temp_dir()
+        for entry in os.listdir(own_dir):
+            path = os.path.join(own_dir, entry)
+            if path in live_paths:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+        # Directories left by server processes that have exited. Only checked
+        # on POSIX, where signal 0 probes a pid without touching the process.
+        if os.name != 'posix':
+            return
+        temp_root = tempfile.gettempdir()
+        for entry in os.listdir(temp_root):
+            pid = entry[len(BULK_TEMP_DIR_PREFIX):]
+            if not entry.startswith(BULK_TEMP_DIR_PREFIX) or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                shutil.rmtree(os.path.join(temp_root, entry), ignore_errors=True)
+            except OSError:
+                pass
+
+@st.cache_resource
+def get_bulk_job_registry():
+    """One registry per server process, shared by every session"""
+    return BulkJobRegistry()
+
+def track_bulk_job():
+    """Mark this session's bulk job as still in use and sweep abandoned ones"""
+    registry = get_bulk_job_registry()
+    job = st.session_state.bulk_job
+    if job is not None:
+        if job.removed:
+            st.session_state.bulk_job = None
+        else:
+            registry.touch(job)
+    registry.sweep()
+
+# ==================== URL FETCH QUEUE ====================
+URL_FETCH_WORKERS = 8       # Concurrent fetches shared by all sessions
+URL_JOB_TTL_SECONDS = 300   # Unclaimed finished jobs are dropped after this
+URL_POLL_SECONDS = 0.5      # How often the page checks on a pending fetch
+
+class UrlFetchQueue:
+    """Background URL fetcher shared across sessions
+
+    Jobs are addressed by ID so a session can pick up its result on a later
+    rerun. Requests for a URL that is already being fetched attach to the
+    in-flight fetch instead of starting another one.
+    """
+
+    def __init__(self, max_workers=URL_FETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="url-fetch")
+        self._lock = threading.Lock()
+        self._in_flight = {}    # url -> Future
+        self._jobs = {}         # job_id -> (Future, submitted_at)
+
+    def submit(self, url):
+        """Queue a fetch for ``url`` and return its job ID"""
+        url = url.strip()
+        started = None
+        with self._lock:
+            self._prune()
+            future = self._in_flight.get(url)
+            if future is None:
+                future = started = self._executor.submit(extract_article_from_url, url)
+                self._in_flight[url] = future
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = (future, time.time())
+        # Registered outside the lock: an already-finished future runs the
+        # callback immediately on this thread, and _finish takes the lock
+        if started is not None:
+            started.add_done_callback(lambda f, url=url: self._finish(url, f))
+        return job_id
+
+    def poll(self, job_id):
+        """Return ("pending" | "done" | "missing", result) without blocking"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return "missing", None
+            future = entry[0]
+            if not future.done():
+                return "pending", None
+            del self._jobs[job_id]
+        return "done", future.result()
+
+    def evict_finished(self):
+        """Drop every finished, unclaimed result; returns estimated bytes freed"""
+        with self._lock:
+            finished = [job_id for job_id, (future, _) in self._jobs.items() if future.done()]
+            freed = sum(sys.getsizeof(self._jobs[job_id][0].result()) +
+                        sum(sys.getsizeof(part) for part in self._jobs[job_id][0].result())
+                        for job_id in finished)
+            for job_id in finished:
+                del self._jobs[job_id]
+        return freed
+
+    def _finish(self, url, future):
+        with self._lock:
+            if self._in_flight.get(url) is future:
+                del self._in_flight[url]
+
+    def _prune(self):
+        # Drop results nobody came back for (closed tabs, abandoned sessions)
+        cutoff = time.time() - URL_JOB_TTL_SECONDS
+        expired = [job_id for job_id, (future, submitted_at) in self._jobs.items()
+                   if future.done() and submitted_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+@st.cache_resource
+def get_url_fetch_queue():
+    """One fetch queue per server process, shared by every session"""
+    return UrlFetchQueue()
+
+# ==================== MEMORY PROFILING ====================
+# Opt-in: set FAKE_NEWS_MEMORY_PROFILE=1 to trace allocations with tracemalloc.
+# Session budgets are enforced whether or not tracing is on.
+#
+# Tracing only runs inside a profiled block: it is started when the block
+# begins and stopped when it ends, so snapshots only hold what the block
+# allocated and kept. Blocks are serialized process-wide. Net/peak numbers use
+# a 1-frame trace, which is cheap; deep tracebacks for allocation sites cost
+# seconds per chart and are only taken while a session has capture switched on.
+# tracemalloc still sees every thread, so a block's numbers include whatever
+# background workers allocated meanwhile; they are reported as process-wide
+# and only labelled with the session that triggered them.
+MEMORY_PROFILE_ENABLED = os.environ.get('FAKE_NEWS_MEMORY_PROFILE', '0') == '1'
+SESSION_MEMORY_BUDGET_MB = float(os.environ.get('FAKE_NEWS_SESSION_BUDGET_MB', '10'))
+PROCESS_MEMORY_BUDGET_MB = float(os.environ.get('FAKE_NEWS_PROCESS_BUDGET_MB', '1024'))
+PROCESS_EVICTION_INTERVAL_SECONDS = 30  # RSS rarely drops at once; don't evict every rerun
+MEMORY_TOP_SITES = 10
+MEMORY_TRACKED_SESSIONS = 100
+MEMORY_TRACE_DEPTH = int(os.environ.get('FAKE_NEWS_MEMORY_TRACE_DEPTH', '10'))  # Frames per allocation; cost grows with depth
+MEMORY_PROFILED_FILES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('app.py', 'batch.py', 'detector.py')
+]
+
+def estimate_size(obj, _seen=None):
+    """Approximate deep size of an object in bytes"""
+    if _seen is None:
+        _seen = set()
+    if obj is None or id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, BulkScoringJob):
+        return estimate_size(obj.snapshot()['preview'], _seen)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    return size
+
+def bulk_download_size(state):
+    """Bytes of the result file when its download payload is on the page"""
+    job = state['bulk_job']
+    if job is None or not state['bulk_download_ready'] or job.removed:
+        return 0
+    try:
+        return os.path.getsize(job.output_path)
+    except OSError:
+        return 0
+
+def _clear_bulk_preview(state):
+    state['bulk_job'].clear_preview()
+
+def _drop_bulk_download(state):
+    state['bulk_download_ready'] = False
+
+def _drop_url_fetched(state):
+    state['url_fetched'] = None
+
+def _drop_current_result(state):
+    state['current_result'] = None
+
+def _trim_history(state):
+    state['analysis_history'] = state['analysis_history'][-5:]
+
+# (component, size estimate, eviction) in eviction order: cheapest to lose
+# first, history is trimmed last and never fully dropped
+SESSION_COMPONENTS = [
+    ('url_fetched', lambda state: estimate_size(state['url_fetched']), _drop_url_fetched),
+    ('bulk_download', bulk_download_size, _drop_bulk_download),
+    ('bulk_preview', lambda state: estimate_size(state['bulk_job']), _clear_bulk_preview),
+    ('current_result', lambda state: estimate_size(state['current_result']), _drop_current_result),
+    ('analysis_history', lambda state: estimate_size(state['analysis_history']), _trim_history)
+]
+
+def session_memory_components(state):
+    """Estimated memory held by each piece of a session's state"""
+    return {name: size(state) for name, size, _ in SESSION_COMPONENTS}
+
+def evict_session_data(state, budget_bytes):
+    """Evict session data until it fits the budget; returns (components, [(name, freed)])"""
+    components = session_memory_components(state)
+    evicted = []
+    for name, size, evict in SESSION_COMPONENTS:
+        if sum(components.values()) <= budget_bytes:
+            break
+        if components[name] == 0:
+            continue
+        evict(state)
+        new_size = size(state)
+        evicted.append((name, components[name] - new_size))
+        components[name] = new_size
+    return components, evicted
+
+def process_rss():
+    """Current resident set size in bytes, or None if it can't be read cheaply"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        # No /proc (macOS, Windows): the process budget is not enforced
+        return None
+
+class MemoryProfiler:
+    """Collects process-wide tracemalloc deltas, keyed by triggering session and component"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sessions = {}          # session_id -> {component: stats}
+        self.top_sites = []
+        self.evictions = deque(maxlen=50)
+        self.last_process_eviction = 0.0
+        # Held for the whole of a profiled block; tracing is process-global
+        self.block_lock = threading.RLock()
+
+    def record(self, session_id, component, delta, peak, top_sites):
+        with self._lock:
+            session = self.sessions.pop(session_id, {})
+            stats = session.setdefault(component, {'calls': 0, 'net_bytes': 0, 'last_delta': 0, 'peak': 0})
+            stats['calls'] += 1
+            stats['net_bytes'] += delta
+            stats['last_delta'] = delta
+            stats['peak'] = max(stats['peak'], peak)
+            # Re-insert so the dict stays ordered by recency, then drop the oldest
+            self.sessions[session_id] = session
+            while len(self.sessions) > MEMORY_TRACKED_SESSIONS:
+                del self.sessions[next(iter(self.sessions))]
+            if top_sites is not None:
+                self.top_sites = top_sites
+
+    def rows(self):
+        """Flat copy of all recorded deltas, taken under the lock"""
+        with self._lock:
+            return [
+                {'session': session_id[:8], 'component': name, 'calls': stats['calls'],
+                 'net_kb': round(stats['net_bytes'] / 1024, 1),
+                 'last_kb': round(stats['last_delta'] / 1024, 1),
+                 'peak_kb': round(stats['peak'] / 1024, 1)}
+                for session_id, session in self.sessions.items()
+                for name, stats in session.items()
+            ]
+
+    def should_evict_process_caches(self):
+        """True at most once per PROCESS_EVICTION_INTERVAL_SECONDS"""
+        with self._lock:
+            now = time.time()
+            if now - self.last_process_eviction < PROCESS_EVICTION_INTERVAL_SECONDS:
+                return False
+            self.last_process_eviction = now
+            return True
+
+    def log_eviction(self, session_id, component, freed):
+        with self._lock:
+            self.evictions.append({
+                'time': datetime.now().strftime("%H:%M:%S"),
+                'session': session_id[:8],
+                'component': component,
+                'freed_kb': round(freed / 1024, 1)
+            })
+
+@st.cache_resource
+def get_memory_profiler():
+    """One profiler per server process, shared by every session"""
+    return MemoryProfiler()
+
+def get_session_id():
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+def take_app_snapshot():
+    """Snapshot of allocations with an app source file anywhere in their traceback"""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(True, path, all_frames=True) for path in MEMORY_PROFILED_FILES]
+    )
+
+def allocation_sites(stats):
+    """Largest allocations, credited to the innermost app frame
+
+    ``stats`` are Statistic/StatisticDiff entries grouped by 'traceback'. An
+    allocation made inside pandas or plotly is reported at the app line that
+    called into the library, with the library frame alongside.
+    """
+    sites = {}
+    for stat in stats:
+        # Tracebacks are ordered oldest frame first
+        frames = list(stat.traceback)
+        app_index = max(i for i, frame in enumerate(frames) if frame.filename in MEMORY_PROFILED_FILES)
+        app_frame = frames[app_index]
+        site = f"{os.path.basename(app_frame.filename)}:{app_frame.lineno}"
+        entry = sites.setdefault(site, {'site': site, 'size_kb': 0.0, 'count': 0, 'allocated_in': ''})
+        entry['size_kb'] += getattr(stat, 'size_diff', stat.size) / 1024
+        entry['count'] += getattr(stat, 'count_diff', stat.count)
+        if app_index + 1 < len(frames) and not entry['allocated_in']:
+            innermost = frames[-1]
+            entry['allocated_in'] = f"{os.path.basename(innermost.filename)}:{innermost.lineno}"
+
+    top = sorted(sites.values(), key=lambda entry: abs(entry['size_kb']), reverse=True)[:MEMORY_TOP_SITES]
+    for entry in top:
+        entry['size_kb'] = round(entry['size_kb'], 1)
+    return top
+
+@contextmanager
+def profile_block(component):
+    """Measure memory kept and peak during the block, and optionally where it was allocated
+
+    Not used around views that poll (bulk analysis): blocks are serialized,
+    so a polling view would hold up every other session's profiling.
+    """
+    if not MEMORY_PROFILE_ENABLED:
+        yield
+        return
+
+    profiler = get_memory_profiler()
+    capture_sites = st.session_state.get('memory_capture_sites', False)
+    with profiler.block_lock:
+        # Someone else (PYTHONTRACEMALLOC, an outer block) may already be tracing
+        owns_trace = not tracemalloc.is_tracing()
+        if owns_trace:
+            tracemalloc.start(MEMORY_TRACE_DEPTH if capture_sites else 1)
+            before = None
+        else:
+            before = take_app_snapshot() if capture_sites else None
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            end_current, peak = tracemalloc.get_traced_memory()
+            top_sites = None
+            if capture_sites:
+                after = take_app_snapshot()
+                stats = after.statistics('traceback') if owns_trace else after.compare_to(before, 'traceback')
+                top_sites = allocation_sites(stats)
+            if owns_trace:
+                tracemalloc.stop()
+            profiler.record(get_session_id(), component, end_current - start_current,
+                            peak - start_current, top_sites)
+
+def evict_process_caches():
+    """Drop caches shared across sessions; returns names of what was cleared"""
+    load_batch_history.clear()
+    get_url_fetch_queue().evict_finished()
+    get_bulk_job_registry().clear_previews()
+    return ['batch_history_cache', 'url_fetch_queue', 'bulk_previews']
+
+def enforce_memory_budget():
+    """Evict cached data from this session (and shared caches) when over budget"""
+    profiler = get_memory_profiler()
+    session_id = get_session_id()
+
+    components, evicted = evict_session_data(st.session_state, SESSION_MEMORY_BUDGET_MB * 1024 * 1024)
+    for name, freed in evicted:
+        profiler.log_eviction(session_id, name, freed)
+
+    rss = process_rss()
+    if rss is not None and rss > PROCESS_MEMORY_BUDGET_MB * 1024 * 1024 \
+            and profiler.should_evict_process_caches():
+        for name in evict_process_caches():
+            profiler.log_eviction(session_id, name, 0)
+
+    return components
+
+def render_memory_profile(components):
+    """Sidebar panel with memory accounting (profiling mode only)"""
+    profiler = get_memory_profiler()
+
+    st.subheader("🧠 Memory Profile")
+    rss = process_rss()
+    if rss is not None:
+        st.metric("Process RSS", f"{rss / 1024 / 1024:.0f} MB",
+                  help=f"Shared caches are evicted above {PROCESS_MEMORY_BUDGET_MB:.0f} MB")
+
+    with st.expander("This Session's State"):
+        st.write(f"**Budget:** {SESSION_MEMORY_BUDGET_MB:.0f} MB")
+        st.dataframe(
+            pd.DataFrame(
+                [{'component': name, 'size_kb': round(size / 1024, 1)} for name, size in components.items()]
+            ),
+            use_container_width=True, hide_index=True
+        )
+
+    with st.expander("Process-wide Deltas"):
+        st.caption("Memory kept (net) and peak while a block ran, labelled with the session "
+                   "that triggered it. Process-wide: includes concurrent allocations from "
+                   "background workers.")
+        rows = profiler.rows()
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        else:
+            st.write("No measurements yet")
+
+    with st.expander("Top Allocation Sites (app code)"):
+        st.toggle("Capture allocation sites", key="memory_capture_sites",
+                  help="Records deep tracebacks in this session's profiled blocks; "
+                       "charts render several seconds slower while on")
+        if profiler.top_sites:
+            st.dataframe(pd.DataFrame(profiler.top_sites), use_container_width=True, hide_index=True)
+        else:
+            st.write("Run an analysis to capture allocation sites")
+
+    if profiler.evictions:
+        with st.expander("Evictions"):
+            st.dataframe(pd.DataFrame(list(profiler.evictions)), use_container_width=True, hide_index=True)
+
 # ==================== PAGE RENDERING FUNCTIONS ====================
 def render_text_analysis():
     """Render the text analysis interface"""
@@ -490,33 +1104,167 @@ def render_url_analysis():
         help="Supported: Most news websites and blogs"
     )
     
+    url_job = st.session_state.url_job
+    
     col1, col2 = st.columns([1, 4])
     
     with col1:
         fetch_btn = st.button(
             "🌐 Fetch & Analyze", 
             type="primary",
-            disabled=not url.strip()
+            disabled=not url.strip() or url_job is not None
         )
     
     if fetch_btn and url:
-        with st.spinner("🔄 Fetching and analyzing article content..."):
-            headline, article_text = extract_article_from_url(url)
-            
-            if headline and article_text:
-                st.success("✅ Content fetched successfully!")
-                
-                with st.expander("📄 Review Extracted Content", expanded=True):
-                    st.text_input("**Headline:**", value=headline, key="url_headline_display")
-                    st.text_area("**Article Text:**", value=article_text, height=150, key="url_article_display")
-                
-                if st.button("🔍 Analyze Fetched Content", type="secondary", use_container_width=True):
-                    perform_analysis(headline, article_text)
+        st.session_state.url_job = {'job_id': get_url_fetch_queue().submit(url), 'url': url.strip()}
+        st.session_state.url_fetched = None
+        st.rerun()
+    
+    if url_job is not None:
+        status, fetched = get_url_fetch_queue().poll(url_job['job_id'])
+        if status == "pending":
+            st.info(f"🔄 Fetching article content from {url_job['url']} ...")
+            time.sleep(URL_POLL_SECONDS)
+            st.rerun()
+        
+        st.session_state.url_job = None
+        if status == "missing":
+            st.error("❌ The fetch job expired before its result was collected. Please fetch again.")
+        else:
+            headline, article_text, error = fetched
+            st.session_state.url_fetched = {
+                'url': url_job['url'], 'headline': headline, 'text': article_text, 'error': error
+            }
+            st.session_state.url_headline_display = headline
+            st.session_state.url_article_display = article_text
+    
+    fetched = st.session_state.url_fetched
+    if fetched is None:
+        return
+    
+    if fetched['error']:
+        st.warning(f"⚠️ Could not extract content from URL. Using demo content. Error: {fetched['error']}")
+    else:
+        st.success("✅ Content fetched successfully!")
+    
+    # Widget state is dropped while the user is on another page; restore it
+    if 'url_headline_display' not in st.session_state:
+        st.session_state.url_headline_display = fetched['headline']
+    if 'url_article_display' not in st.session_state:
+        st.session_state.url_article_display = fetched['text']
+    
+    with st.expander("📄 Review Extracted Content", expanded=True):
+        headline = st.text_input("**Headline:**", key="url_headline_display")
+        article_text = st.text_area("**Article Text:**", height=150, key="url_article_display")
+    
+    if st.button("🔍 Analyze Fetched Content", type="secondary", use_container_width=True,
+                 disabled=not (headline.strip() and article_text.strip())):
+        perform_analysis(headline, article_text)
+
+def render_bulk_analysis():
+    """Render the bulk file analysis interface"""
+    st.subheader("📂 Bulk Analysis")
+    st.write("Upload a CSV or JSONL file with `headline` and `text` columns to score many articles at once:")
+
+    uploaded_file = st.file_uploader(
+        "**Articles File:**",
+        type=["csv", "jsonl"],
+        key="bulk_upload",
+        help="Large files are processed in chunks in the background - you can keep using the app."
+    )
+
+    job = st.session_state.bulk_job
+    running = job is not None and job.snapshot()['status'] == "running"
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        if st.button("🚀 Start Bulk Scoring", type="primary",
+                     disabled=uploaded_file is None or running, use_container_width=True):
+            start_bulk_job(uploaded_file)
+            st.rerun()
+
+    with col2:
+        if st.button("⏹️ Cancel", disabled=not running, use_container_width=True):
+            job.cancel()
+            st.rerun()
+
+    if job is None:
+        st.info("📝 No bulk job yet. Upload a file and start scoring to see results here!")
+        return
+
+    snapshot = job.snapshot()
+
+    st.progress(snapshot['progress'])
+    rate = snapshot['rows_done'] / snapshot['elapsed'] if snapshot['elapsed'] > 0 else 0
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Articles Scored", f"{snapshot['rows_done']:,}")
+    with col2:
+        st.metric("Throughput", f"{rate:,.0f} / sec")
+    with col3:
+        fake_count = sum(count for verdict, count in snapshot['verdict_counts'].items() if 'FAKE' in verdict)
+        st.metric("Likely Fake", f"{fake_count:,}")
+    with col4:
+        st.metric("Status", snapshot['status'].title())
+
+    if snapshot['status'] == "failed":
+        st.error(f"❌ Bulk scoring failed: {snapshot['error']}")
+    elif snapshot['rows_skipped']:
+        st.warning(f"⚠️ Skipped {snapshot['rows_skipped']:,} malformed lines or records without a 'text' field.")
+
+    if snapshot['verdict_counts']:
+        counts_df = pd.DataFrame(
+            list(snapshot['verdict_counts'].items()), columns=['verdict', 'count']
+        )
+        fig = px.bar(counts_df, x='verdict', y='count', title='Verdict Breakdown',
+                     labels={'verdict': 'Verdict', 'count': 'Articles'})
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.write(f"### 📋 Latest Results (last {BULK_PREVIEW_ROWS})")
+    preview_df = pd.DataFrame(snapshot['preview'], columns=BULK_RESULT_COLUMNS)
+    # The download keeps full headlines; only the on-page table is shortened
+    long_headlines = preview_df['headline'].str.len() > BULK_HEADLINE_PREVIEW_CHARS
+    preview_df.loc[long_headlines, 'headline'] = (
+        preview_df.loc[long_headlines, 'headline'].str[:BULK_HEADLINE_PREVIEW_CHARS] + "..."
+    )
+    st.dataframe(preview_df, use_container_width=True, hide_index=True)
+
+    if snapshot['status'] == "running":
+        time.sleep(BULK_POLL_SECONDS)
+        st.rerun()
+    elif snapshot['rows_done'] > 0:
+        # The payload is only loaded into the page on request; it counts
+        # against the session memory budget while shown
+        if not st.session_state.bulk_download_ready:
+            if st.button("📦 Prepare Download", use_container_width=True):
+                st.session_state.bulk_download_ready = True
+                st.rerun()
+        else:
+            with open(job.output_path, 'rb') as results_file:
+                st.download_button(
+                    "⬇️ Download Results (CSV)",
+                    data=results_file,
+                    file_name=f"fake_news_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
 
 def render_history():
     """Render analysis history"""
     st.subheader("📊 Analysis History")
     
+    tab1, tab2 = st.tabs(["🧑 This Session", "🗂️ Batch Results"])
+    
+    with tab1:
+        render_session_history()
+    
+    with tab2:
+        render_batch_history()
+
+def render_session_history():
+    """Render this session's analysis history"""
     if not st.session_state.analysis_history:
         st.info("📝 No analysis history yet. Analyze some articles to see your history here!")
         return
@@ -565,6 +1313,96 @@ def render_history():
                              labels={'score': 'Risk Score'})
             st.plotly_chart(fig, use_container_width=True)
 
+@st.cache_resource(max_entries=4)
+def load_batch_history(path, signature):
+    """Memory-map batch results, keeping only the columns the history views use
+
+    ``signature`` (file names and mtimes) makes new or rewritten shards reload.
+    """
+    return load_result_columns(path, ['date', 'headline', 'verdict', 'confidence', 'score'])
+
+def render_batch_history():
+    """Render results written by batch.py"""
+    path = st.text_input(
+        "**Batch work directory or results file:**",
+        value=os.environ.get('FAKE_NEWS_BATCH_DIR', ''),
+        placeholder="/shared/work",
+        key="batch_results_path",
+        help="Reads the .arrow files produced by `python batch.py work`"
+    ).strip()
+    
+    if not path:
+        st.info("📝 Point this at a batch work directory to explore its results here!")
+        return
+    if not os.path.exists(path):
+        st.error(f"❌ {path} does not exist")
+        return
+    
+    files = result_files(path)
+    if not files:
+        st.info("📝 No finished shards yet.")
+        return
+    
+    try:
+        signature = tuple((f, os.path.getmtime(f)) for f in files)
+        table = load_batch_history(path, signature)
+    except (pa.ArrowInvalid, OSError) as e:
+        st.error(f"❌ Could not read batch results: {e}")
+        return
+    
+    # Aggregate in Arrow; only small summaries become DataFrames
+    verdicts = table['verdict']
+    st.write("### 📈 Summary Statistics")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Analyses", f"{table.num_rows:,}")
+    with col2:
+        st.metric("Real Articles", f"{pc.sum(pc.match_substring(verdicts, 'REAL')).as_py() or 0:,}")
+    with col3:
+        st.metric("Fake Articles", f"{pc.sum(pc.match_substring(verdicts, 'FAKE')).as_py() or 0:,}")
+    with col4:
+        st.metric("Suspicious", f"{pc.sum(pc.match_substring(verdicts, 'SUSPICIOUS')).as_py() or 0:,}")
+    
+    st.write(f"### 📋 Sample Results (first {BULK_PREVIEW_ROWS})")
+    st.dataframe(table.slice(0, BULK_PREVIEW_ROWS).to_pandas(), use_container_width=True, hide_index=True)
+    
+    st.write("### 📊 Trends Over Time")
+    tab1, tab2 = st.tabs(["Confidence Trend", "Risk Score Distribution"])
+    
+    with tab1:
+        daily_df = (
+            table.select(['date', 'confidence'])
+            .group_by('date')
+            .aggregate([('confidence', 'mean'), ('confidence', 'count')])
+            .to_pandas()
+            .dropna(subset=['date'])
+            .sort_values('date')
+        )
+        if daily_df.empty:
+            st.info("📝 These results have no article dates.")
+        else:
+            fig = px.line(daily_df, x='date', y='confidence_mean',
+                         title='Mean Analysis Confidence per Day', markers=True,
+                         hover_data={'confidence_count': True},
+                         labels={'date': 'Date', 'confidence_mean': 'Confidence %',
+                                 'confidence_count': 'Articles'})
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with tab2:
+        # Bin one record batch at a time: a float chunk without nulls is a
+        # zero-copy view of the mapped file, so the column is never copied whole
+        edges = np.linspace(0, 1, 11)
+        counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        for chunk in table['score'].chunks:
+            scores = chunk.to_numpy() if chunk.null_count == 0 else chunk.drop_null().to_numpy()
+            counts += np.histogram(scores, bins=edges)[0]
+        histogram_df = pd.DataFrame({'score': (edges[:-1] + edges[1:]) / 2, 'count': counts})
+        fig = px.bar(histogram_df, x='score', y='count',
+                     title='Distribution of Risk Scores',
+                     labels={'score': 'Risk Score', 'count': 'Articles'})
+        st.plotly_chart(fig, use_container_width=True)
+
 def render_about():
     """Render about page"""
     col1, col2 = st.columns([2, 1])
@@ -675,6 +1513,8 @@ def main():
     # Load CSS and initialize session state
     load_css()
     initialize_session_state()
+    track_bulk_job()
+    memory_components = enforce_memory_budget()
     
     # Hackathon Banner
     st.markdown("""
@@ -694,7 +1534,7 @@ def main():
         
         analysis_type = st.radio(
             "**Choose Analysis Method:**",
-            ["📝 Text Analysis", "🔗 URL Analysis", "📊 Analysis History", "ℹ️ About & Help"]
+            ["📝 Text Analysis", "🔗 URL Analysis", "📂 Bulk Analysis", "📊 Analysis History", "ℹ️ About & Help"]
         )
         
         st.markdown("---")
@@ -726,6 +1566,10 @@ def main():
         else:
             st.write("No analyses yet")
         
+        if MEMORY_PROFILE_ENABLED:
+            st.markdown("---")
+            render_memory_profile(memory_components)
+        
         st.markdown("---")
         st.subheader("🏆 Hackathon Ready")
         st.success("""
@@ -741,8 +1585,11 @@ def main():
         render_text_analysis()
     elif analysis_type == "🔗 URL Analysis":
         render_url_analysis()
+    elif analysis_type == "📂 Bulk Analysis":
+        render_bulk_analysis()
     elif analysis_type == "📊 Analysis History":
-        render_history()
+        with profile_block("history_charts"):
+            render_history()
     else:
         render_about()
 
@@ -0,0 +1,565 @@
+# ==================== IMPORTS ====================
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import tempfile
+import sys
+import time
+import uuid
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from detector import MockFakeNewsDetector
+
+# ==================== CONFIG ====================
+DEFAULT_SHARD_SIZE = 10000       # Articles per shard
+DEFAULT_LEASE_SECONDS = 120      # A worker must renew its lease within this window
+DEFAULT_MAX_ATTEMPTS = 3         # Claims per shard before it is marked failed
+RENEW_EVERY_RECORDS = 500        # Records scored between lease renewals
+IDLE_POLL_SECONDS = 2.0          # Wait between scans while other workers hold leases
+
+# Work directory layout (shared between all nodes, e.g. an NFS mount):
+#   manifest.json               shard count and input description
+#   shards/shard-NNNNN.jsonl    input articles, one JSON object per line
+#   leases/shard-NNNNN.lease    current owner and expiry of an in-progress shard
+#   attempts/shard-NNNNN/*      one file per claim, used to cap retries
+#   done/shard-NNNNN.arrow      scored output; its presence marks the shard done
+#   failed/shard-NNNNN.json     shard gave up after too many attempts
+#   summary.json                written by the merge step
+#
+# Claims rely on link() and rename() being atomic on the shared
+# filesystem. Lease expiry compares wall-clock times, so node clocks should be
+# roughly in sync (well within the lease length).
+
+# ==================== RESULT SCHEMA ====================
+# Scored shards are Arrow IPC files with one record batch per article date.
+# IPC is used rather than Parquet because its buffers can be memory-mapped and
+# read without decoding, so readers only page in the columns they touch.
+RESULT_EXTENSION = '.arrow'
+CATEGORY_COLUMNS = ['emotional', 'urgency', 'conspiracy', 'sensational']
+METRIC_COLUMNS = ['exclamation_marks', 'question_marks', 'all_caps_words', 'text_length']
+
+RESULT_SCHEMA = pa.schema(
+    [
+        ('id', pa.string()),
+        ('date', pa.date32()),
+        ('headline', pa.string()),
+        ('verdict', pa.string()),
+        ('score', pa.float64()),
+        ('confidence', pa.float64()),
+        ('credible_indicators', pa.int32())
+    ]
+    + [(column, pa.int32()) for column in CATEGORY_COLUMNS]
+    + [(column, pa.int32()) for column in METRIC_COLUMNS],
+    metadata={'format': 'fake-news-results', 'version': '1'}
+)
+
+def parse_date(value):
+    """Leading YYYY-MM-DD of a date/timestamp string, or None"""
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return None
+
+def append_result(columns, record, result):
+    """Append one analyze_text result to a dict of column lists"""
+    columns['id'].append(record['id'])
+    columns['date'].append(parse_date(record['date']))
+    columns['headline'].append(record['headline'])
+    columns['verdict'].append(result['verdict'])
+    columns['score'].append(result['score'])
+    columns['confidence'].append(result['confidence'])
+    columns['credible_indicators'].append(len(result['credible_indicators']))
+    for column in CATEGORY_COLUMNS:
+        columns[column].append(result['details'][column])
+    for column in METRIC_COLUMNS:
+        columns[column].append(result['text_metrics'][column])
+
+def write_results(path, columns_by_date):
+    """Write results as an Arrow IPC file, one record batch per date"""
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, RESULT_SCHEMA) as writer:
+        for day in sorted(columns_by_date, key=lambda d: (d is None, d or date.min)):
+            writer.write_batch(pa.RecordBatch.from_pydict(columns_by_date[day], schema=RESULT_SCHEMA))
+
+def result_files(path):
+    """Result files under a work directory, a directory of .arrow files, or a single .arrow file"""
+    if os.path.isfile(path):
+        return [path] if path.endswith(RESULT_EXTENSION) else []
+    done_dir = os.path.join(path, 'done')
+    directory = done_dir if os.path.isdir(done_dir) else path
+    return sorted(os.path.join(directory, entry) for entry in os.listdir(directory)
+                  if entry.endswith(RESULT_EXTENSION))
+
+def load_result_columns(path, columns):
+    """Memory-map result files and return a Table holding only ``columns``
+
+    No data is copied: the returned columns point into the mapped files.
+    Raises pa.ArrowInvalid for files that are not batch results.
+    """
+    tables = []
+    for result_path in result_files(path):
+        reader = pa.ipc.open_file(pa.memory_map(result_path, 'r'))
+        if not reader.schema.equals(RESULT_SCHEMA):
+            raise pa.ArrowInvalid(f"{result_path} is not a batch results file")
+        tables.append(reader.read_all().select(columns))
+    if not tables:
+        return RESULT_SCHEMA.empty_table().select(columns)
+    return pa.concat_tables(tables)
+
+# ==================== WORK DIRECTORY ====================
+def shard_name(index):
+    return f"shard-{index:05d}"
+
+def work_paths(work_dir):
+    return {name: os.path.join(work_dir, name)
+            for name in ('shards', 'leases', 'attempts', 'done', 'failed')}
+
+def write_json_atomic(path, data):
+    """Write JSON so readers on other nodes never see a partial file"""
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def iter_input_records(input_path, chunk_size=DEFAULT_SHARD_SIZE):
+    """Yield article dicts from a CSV or JSONL corpus without loading it whole"""
+    if input_path.lower().endswith('.csv'):
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            yield from chunk.to_dict('records')
+    else:
+        with open(input_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+def shard_corpus(input_path, work_dir, shard_size=DEFAULT_SHARD_SIZE):
+    """Split a corpus into JSONL shards in a fresh work directory"""
+    paths = work_paths(work_dir)
+    if os.path.exists(os.path.join(work_dir, 'manifest.json')):
+        raise ValueError(f"{work_dir} already holds a sharded corpus")
+    for path in paths.values():
+        os.makedirs(path, exist_ok=True)
+
+    shard_count = 0
+    record_count = 0
+    shard_file = None
+    try:
+        for record in iter_input_records(input_path):
+            if record_count % shard_size == 0:
+                if shard_file:
+                    shard_file.close()
+                shard_file = open(os.path.join(paths['shards'], f"{shard_name(shard_count)}.jsonl"),
+                                  'w', encoding='utf-8')
+                shard_count += 1
+            shard_file.write(json.dumps({
+                'id': str(record.get('id') or record_count),
+                'date': str(record.get('date') or ''),
+                'headline': str(record.get('headline') or ''),
+                'text': str(record.get('text') or '')
+            }) + '\n')
+            record_count += 1
+    finally:
+        if shard_file:
+            shard_file.close()
+
+    manifest = {
+        'input': os.path.abspath(input_path),
+        'shards': shard_count,
+        'records': record_count,
+        'shard_size': shard_size,
+        'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+    write_json_atomic(os.path.join(work_dir, 'manifest.json'), manifest)
+    return manifest
+
+# ==================== LEASES ====================
+class Lease:
+    """A worker's claim on one shard"""
+
+    def __init__(self, work_dir, name, worker_id, lease_seconds):
+        self.path = os.path.join(work_paths(work_dir)['leases'], f"{name}.lease")
+        self.name = name
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.token = uuid.uuid4().hex
+
+    def _content(self):
+        return {'worker': self.worker_id, 'token': self.token,
+                'expires_at': time.time() + self.lease_seconds}
+
+    def acquire(self):
+        """Create the lease file; False if another worker already holds it"""
+        # Write the lease in full first, then link() it into place: the lease
+        # appears atomically with its content, so a crash can't leave it empty
+        tmp_path = f"{self.path}.tmp-{self.token}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._content(), f)
+        try:
+            os.link(tmp_path, self.path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def still_held(self):
+        current = read_json(self.path)
+        return current is not None and current.get('token') == self.token
+
+    def renew(self):
+        """Push the expiry forward; False if the lease was lost to another worker"""
+        if not self.still_held():
+            return False
+        write_json_atomic(self.path, self._content())
+        return True
+
+    def release(self):
+        if self.still_held():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+def lease_expired(path, lease, lease_seconds):
+    """Whether a lease can be broken; unreadable leases expire by file age"""
+    if lease is not None:
+        return lease.get('expires_at', 0) <= time.time()
+    try:
+        # Torn write or a lease left behind by an older version
+        return os.path.getmtime(path) + lease_seconds <= time.time()
+    except FileNotFoundError:
+        return False
+
+def break_expired_lease(work_dir, name, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Remove a lease whose owner stopped renewing it; True if this call removed it"""
+    path = os.path.join(work_paths(work_dir)['leases'], f"{name}.lease")
+    lease = read_json(path)
+    if not lease_expired(path, lease, lease_seconds):
+        return False
+    # rename() succeeds for exactly one contender, so only one worker breaks the lease
+    stale_path = f"{path}.stale-{uuid.uuid4().hex}"
+    try:
+        os.rename(path, stale_path)
+    except FileNotFoundError:
+        return False
+    if read_json(stale_path) != lease:
+        # Renewed between our read and the rename; put it back unless another
+        # worker has claimed the shard in the meantime (link() never overwrites)
+        try:
+            os.link(stale_path, path)
+        except FileExistsError:
+            pass
+        os.remove(stale_path)
+        return False
+    os.remove(stale_path)
+    if lease is None:
+        return True
+    # Drop the partial output the crashed worker left behind
+    partial_path = os.path.join(work_paths(work_dir)['done'], f"{name}{RESULT_EXTENSION}.tmp-{lease.get('token')}")
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    return True
+
+# ==================== WORKER ====================
+def shard_state(work_dir, name):
+    paths = work_paths(work_dir)
+    if os.path.exists(os.path.join(paths['done'], f"{name}{RESULT_EXTENSION}")):
+        return 'done'
+    if os.path.exists(os.path.join(paths['failed'], f"{name}.json")):
+        return 'failed'
+    if os.path.exists(os.path.join(paths['leases'], f"{name}.lease")):
+        return 'leased'
+    return 'pending'
+
+def list_shards(work_dir):
+    manifest = read_json(os.path.join(work_dir, 'manifest.json'))
+    if manifest is None:
+        raise ValueError(f"{work_dir} has no manifest.json - run the shard step first")
+    return [shard_name(i) for i in range(manifest['shards'])]
+
+def record_attempt(work_dir, name, worker_id):
+    """Log a claim of ``name`` and return how many claims it has had"""
+    attempts_dir = os.path.join(work_paths(work_dir)['attempts'], name)
+    os.makedirs(attempts_dir, exist_ok=True)
+    with open(os.path.join(attempts_dir, uuid.uuid4().hex), 'w', encoding='utf-8') as f:
+        f.write(worker_id)
+    return len(os.listdir(attempts_dir))
+
+def score_shard(work_dir, name, lease, detector):
+    """Score one shard into done/; False if the lease was lost part way through"""
+    paths = work_paths(work_dir)
+    output_path = os.path.join(paths['done'], f"{name}{RESULT_EXTENSION}")
+    tmp_path = f"{output_path}.tmp-{lease.token}"
+    columns_by_date = {}
+
+    with open(os.path.join(paths['shards'], f"{name}.jsonl"), encoding='utf-8') as source:
+        for count, line in enumerate(source, start=1):
+            record = json.loads(line)
+            result = detector.analyze_text(record['headline'], record['text'])
+            columns = columns_by_date.setdefault(
+                parse_date(record['date']), {field.name: [] for field in RESULT_SCHEMA}
+            )
+            append_result(columns, record, result)
+            if count % RENEW_EVERY_RECORDS == 0 and not lease.renew():
+                return False
+
+    write_results(tmp_path, columns_by_date)
+    # Output is complete; publishing it atomically marks the shard done
+    os.replace(tmp_path, output_path)
+    return True
+
+def claim_next_shard(work_dir, shards, worker_id, lease_seconds, max_attempts):
+    """Claim a pending (or abandoned) shard; returns (name, Lease) or (None, None)"""
+    for name in random.sample(shards, len(shards)):
+        state = shard_state(work_dir, name)
+        if state == 'leased' and break_expired_lease(work_dir, name, lease_seconds):
+            state = 'pending'
+        if state != 'pending':
+            continue
+
+        lease = Lease(work_dir, name, worker_id, lease_seconds)
+        if not lease.acquire():
+            continue
+        # Another worker may have finished it between the state check and the claim
+        if shard_state(work_dir, name) == 'done':
+            lease.release()
+            continue
+
+        attempts = record_attempt(work_dir, name, worker_id)
+        if attempts > max_attempts:
+            write_json_atomic(os.path.join(work_paths(work_dir)['failed'], f"{name}.json"),
+                              {'attempts': attempts - 1, 'worker': worker_id})
+            lease.release()
+            continue
+        return name, lease
+    return None, None
+
+def run_worker(work_dir, worker_id=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+               max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Claim and score shards until every shard is done or failed"""
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    shards = list_shards(work_dir)
+    detector = MockFakeNewsDetector()
+    scored = 0
+
+    while True:
+        name, lease = claim_next_shard(work_dir, shards, worker_id, lease_seconds, max_attempts)
+        if name is None:
+            states = [shard_state(work_dir, shard) for shard in shards]
+            if 'leased' not in states and 'pending' not in states:
+                return scored
+            # Other workers hold the rest; wait in case any of them crash
+            time.sleep(IDLE_POLL_SECONDS)
+            continue
+
+        try:
+            if score_shard(work_dir, name, lease, detector):
+                scored += 1
+                print(f"[{worker_id}] finished {name}", flush=True)
+            else:
+                print(f"[{worker_id}] lost lease on {name}", flush=True)
+        except Exception as e:
+            # Leave the shard for a retry; after max_attempts claims it is marked failed
+            print(f"[{worker_id}] error on {name}: {e}", file=sys.stderr, flush=True)
+        finally:
+            lease.release()
+
+# ==================== MERGE ====================
+def merge_results(work_dir):
+    """Aggregate verdict counts across all finished shards into summary.json"""
+    paths = work_paths(work_dir)
+    shards = list_shards(work_dir)
+    verdict_counts = {}
+    total = 0
+    score_sum = 0.0
+    missing = []
+
+    for name in shards:
+        output_path = os.path.join(paths['done'], f"{name}{RESULT_EXTENSION}")
+        if not os.path.exists(output_path):
+            missing.append(name)
+            continue
+        table = load_result_columns(output_path, ['verdict', 'score'])
+        for entry in pc.value_counts(table['verdict']).to_pylist():
+            verdict_counts[entry['values']] = verdict_counts.get(entry['values'], 0) + entry['counts']
+        score_sum += pc.sum(table['score']).as_py() or 0.0
+        total += table.num_rows
+
+    summary = {
+        'shards': len(shards),
+        'shards_merged': len(shards) - len(missing),
+        'missing_shards': missing,
+        'failed_shards': sorted(entry[:-len('.json')] for entry in os.listdir(paths['failed'])
+                                if entry.endswith('.json')),
+        'articles': total,
+        'verdict_counts': verdict_counts,
+        'mean_score': round(score_sum / total, 4) if total else None,
+        'merged_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+    write_json_atomic(os.path.join(work_dir, 'summary.json'), summary)
+    return summary
+
+def shard_status(work_dir):
+    """Count shards in each state"""
+    counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+    for name in list_shards(work_dir):
+        counts[shard_state(work_dir, name)] += 1
+    return counts
+
+# ==================== LOAD BENCHMARK ====================
+HISTORY_COLUMNS = ['date', 'verdict', 'confidence', 'score']
+
+def _history_from_dicts(path):
+    """Old path: row dicts shaped like analyze_text -> pd.DataFrame"""
+    with open(path, encoding='utf-8') as f:
+        history_df = pd.DataFrame([json.loads(line) for line in f])
+    history_df['verdict'].value_counts()
+    history_df.groupby('date')['confidence'].mean()
+    return len(history_df)
+
+def _history_from_columns(path):
+    """New path: memory-mapped Arrow, history columns only"""
+    table = load_result_columns(path, HISTORY_COLUMNS)
+    pc.value_counts(table['verdict'])
+    table.group_by('date').aggregate([('confidence', 'mean')])
+    return table.num_rows
+
+def _bench_child(method, path, queue):
+    import resource  # Unix-only; kept local so the app still imports batch on Windows
+    loader = _history_from_dicts if method == 'dicts' else _history_from_columns
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    rows = loader(path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put({'rows': rows, 'seconds': round(elapsed, 3), 'rss_growth_mb': round((peak_kb - baseline_kb) / 1024, 1)})
+
+def benchmark_history_load(input_path, articles):
+    """Compare loading results for the history view: row dicts vs memory-mapped columns"""
+    bench_dir = tempfile.mkdtemp(prefix="fake_news_bench_")
+    try:
+        detector = MockFakeNewsDetector()
+        dicts_path = os.path.join(bench_dir, 'results.jsonl')
+        arrow_path = os.path.join(bench_dir, f"results{RESULT_EXTENSION}")
+        columns_by_date = {}
+        written = 0
+        with open(dicts_path, 'w', encoding='utf-8') as dicts_file:
+            while written < articles:
+                for record in iter_input_records(input_path):
+                    if written >= articles:
+                        break
+                    record = {'id': str(record.get('id') or written), 'date': str(record.get('date') or ''),
+                              'headline': str(record.get('headline') or ''), 'text': str(record.get('text') or '')}
+                    result = detector.analyze_text(record['headline'], record['text'])
+                    dicts_file.write(json.dumps({
+                        'id': record['id'], 'date': record['date'], 'headline': record['headline'], **result
+                    }) + '\n')
+                    columns = columns_by_date.setdefault(
+                        parse_date(record['date']), {field.name: [] for field in RESULT_SCHEMA}
+                    )
+                    append_result(columns, record, result)
+                    written += 1
+                if written == 0:
+                    raise ValueError(f"{input_path} has no articles")
+        write_results(arrow_path, columns_by_date)
+        del columns_by_date
+
+        # Each loader runs in a fresh process so peak RSS is measured independently
+        context = multiprocessing.get_context('spawn')
+        report = {'articles': written}
+        for method, path in (('dicts', dicts_path), ('columns', arrow_path)):
+            queue = context.Queue()
+            process = context.Process(target=_bench_child, args=(method, path, queue))
+            process.start()
+            report[method] = queue.get()
+            process.join()
+            report[method]['file_mb'] = round(os.path.getsize(path) / 1024 / 1024, 1)
+        return report
+    finally:
+        shutil.rmtree(bench_dir, ignore_errors=True)
+
+# ==================== CLI ====================
+def _worker_process(work_dir, worker_id, lease_seconds, max_attempts):
+    run_worker(work_dir, worker_id, lease_seconds, max_attempts)
+
+def run_local(input_path, work_dir, workers, shard_size, lease_seconds, max_attempts):
+    """Shard, score with several local processes, and merge - a single-node stand-in"""
+    shard_corpus(input_path, work_dir, shard_size)
+    processes = [
+        multiprocessing.Process(target=_worker_process,
+                                args=(work_dir, f"local-{i}", lease_seconds, max_attempts))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return merge_results(work_dir)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded batch scoring for the fake news detector")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    shard_parser = subparsers.add_parser('shard', help="Split a CSV/JSONL corpus into shards")
+    shard_parser.add_argument('input')
+    shard_parser.add_argument('work_dir')
+    shard_parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+
+    work_parser = subparsers.add_parser('work', help="Claim and score shards until none are left")
+    work_parser.add_argument('work_dir')
+    work_parser.add_argument('--worker-id')
+
+    subparsers.add_parser('merge', help="Aggregate finished shards").add_argument('work_dir')
+    subparsers.add_parser('status', help="Show shard progress").add_argument('work_dir')
+
+    local_parser = subparsers.add_parser('run-local', help="Shard, score with N local processes, merge")
+    local_parser.add_argument('input')
+    local_parser.add_argument('work_dir')
+    local_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    local_parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+
+    bench_parser = subparsers.add_parser('bench-load', help="Compare history-view load time and RSS")
+    bench_parser.add_argument('input')
+    bench_parser.add_argument('--articles', type=int, default=1000000)
+
+    for lease_parser in (work_parser, local_parser):
+        lease_parser.add_argument('--lease-seconds', type=float, default=DEFAULT_LEASE_SECONDS)
+        lease_parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'shard':
+        output = shard_corpus(args.input, args.work_dir, args.shard_size)
+    elif args.command == 'work':
+        output = {'shards_scored': run_worker(args.work_dir, args.worker_id,
+                                              args.lease_seconds, args.max_attempts)}
+    elif args.command == 'merge':
+        output = merge_results(args.work_dir)
+    elif args.command == 'status':
+        output = shard_status(args.work_dir)
+    elif args.command == 'bench-load':
+        output = benchmark_history_load(args.input, args.articles)
+    else:
+        output = run_local(args.input, args.work_dir, args.workers, args.shard_size,
+                           args.lease_seconds, args.max_attempts)
+
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
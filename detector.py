@@ -0,0 +1,105 @@
+# ==================== IMPORTS ====================
+import re
+import random
+
+# ==================== MOCK AI MODEL ====================
+class MockFakeNewsDetector:
+    def __init__(self):
+        self.fake_indicators = {
+            'emotional': ['miracle', 'shocking', 'amazing', 'unbelievable', 'breakthrough',
+                         'secret', 'hidden truth', 'they dont want you to know', 'astounding',
+                         'incredible', 'mind-blowing', 'earth-shattering'],
+            'urgency': ['urgent', 'immediately', 'act now', 'breaking', 'last chance',
+                       'limited time', 'don\'t wait', 'instant', 'quick', 'fast'],
+            'conspiracy': ['big pharma', 'cover-up', 'mainstream media', 'government hiding',
+                          'deep state', 'elites', 'suppressed', 'censored', 'they\'re lying'],
+            'sensational': ['you won\'t believe', 'what happened next', 'the truth about',
+                           'exposed', 'revealed', 'secret method', 'doctors hate this']
+        }
+        
+        self.credible_indicators = [
+            'according to', 'study', 'research', 'university', 'official',
+            'confirmed', 'experts say', 'peer-reviewed', 'scientists', 'data shows',
+            'clinical trial', 'journal', 'published', 'report', 'findings'
+        ]
+
+    def analyze_text(self, headline, text):
+        """Mock analysis that simulates real AI behavior"""
+        content = f"{headline} {text}".lower()
+        
+        # Analyze fake indicators
+        fake_score = 0
+        details = {'emotional': 0, 'urgency': 0, 'conspiracy': 0, 'sensational': 0}
+        found_words = {'emotional': [], 'urgency': [], 'conspiracy': [], 'sensational': []}
+        
+        for category, words in self.fake_indicators.items():
+            for word in words:
+                if word in content:
+                    details[category] += 1
+                    found_words[category].append(word)
+                    fake_score += 2 if category == 'conspiracy' else 1
+        
+        # Analyze credible indicators
+        credible_score = 0
+        credible_found = []
+        for indicator in self.credible_indicators:
+            count = content.count(indicator)
+            credible_score += count * 2
+            if count > 0:
+                credible_found.append(indicator)
+        
+        # Text structure analysis
+        exclamation_count = content.count('!')
+        question_count = content.count('?')
+        all_caps = len(re.findall(r'\b[A-Z]{4,}\b', f"{headline} {text}"))
+        
+        # Add structure penalties
+        fake_score += exclamation_count * 0.5
+        fake_score += question_count * 0.3
+        fake_score += all_caps * 1
+        
+        # Length factor (very short texts are suspicious)
+        length_factor = max(0.1, min(1.0, len(text) / 500))
+        
+        # Calculate final scores
+        base_fake_score = min(fake_score, 25) / 25
+        base_credible_score = min(credible_score, 20) / 20
+        
+        # Add small random variation for demo purposes
+        random_variation = random.uniform(-0.1, 0.1)
+        final_score = max(0, min(1, base_fake_score - (base_credible_score * 0.6) + random_variation))
+        
+        # Determine verdict
+        if final_score > 0.7:
+            verdict = "🔴 HIGH RISK - LIKELY FAKE"
+            confidence = final_score
+            color = "fake"
+        elif final_score > 0.4:
+            verdict = "🟡 MEDIUM RISK - SUSPICIOUS"
+            confidence = 0.5
+            color = "suspicious"
+        else:
+            verdict = "🟢 LOW RISK - LIKELY REAL"
+            confidence = 1 - final_score
+            color = "real"
+        
+        return {
+            'verdict': verdict,
+            'confidence': round(confidence * 100, 1),
+            'score': round(final_score, 3),
+            'details': details,
+            'found_words': found_words,
+            'credible_indicators': credible_found,
+            'text_metrics': {
+                'exclamation_marks': exclamation_count,
+                'question_marks': question_count,
+                'all_caps_words': all_caps,
+                'text_length': len(text),
+                'length_factor': round(length_factor, 2)
+            },
+            'component_scores': {
+                'fake_indicators_score': round(base_fake_score * 100, 1),
+                'credible_indicators_score': round(base_credible_score * 100, 1),
+                'structure_penalty': exclamation_count + all_caps
+            }
+        }
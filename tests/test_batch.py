@@ -0,0 +1,151 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+
+import pyarrow as pa
+import pytest
+
+import batch
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BATCH_SCRIPT = os.path.join(REPO_ROOT, 'batch.py')
+
+
+def write_corpus(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            f.write(json.dumps({
+                'id': i,
+                'date': f"2026-10-{i % 3 + 1:02d}",
+                'headline': 'SHOCKING miracle!!' if i % 2 else 'Study finds',
+                'text': 'According to a university study published in a journal'
+            }) + '\n')
+
+
+def run_workers(work_dir, count, *args, timeout=60):
+    """Run ``count`` worker processes against work_dir and wait for all of them"""
+    processes = [
+        subprocess.Popen(
+            [sys.executable, BATCH_SCRIPT, 'work', str(work_dir), '--worker-id', f"test-{i}", *args],
+            cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for i in range(count)
+    ]
+    for process in processes:
+        process.communicate(timeout=timeout)
+        assert process.returncode == 0
+
+
+def test_workers_take_over_expired_and_unreadable_leases(tmp_path):
+    corpus = tmp_path / 'corpus.jsonl'
+    work_dir = tmp_path / 'work'
+    write_corpus(corpus, 300)
+    manifest = batch.shard_corpus(str(corpus), str(work_dir), shard_size=100)
+    leases_dir = work_dir / 'leases'
+
+    # A worker that crashed mid-shard: its lease expired without being renewed
+    crashed = batch.Lease(str(work_dir), 'shard-00000', 'crashed', lease_seconds=-1)
+    assert crashed.acquire()
+    # A torn lease write: empty file, older than the lease length
+    torn_lease = leases_dir / 'shard-00001.lease'
+    torn_lease.write_text('')
+    old = time.time() - 10
+    os.utime(torn_lease, (old, old))
+
+    run_workers(work_dir, 2, '--lease-seconds', '2')
+
+    assert batch.shard_status(str(work_dir)) == {'pending': 0, 'leased': 0, 'done': 3, 'failed': 0}
+    assert os.listdir(leases_dir) == []
+    summary = batch.merge_results(str(work_dir))
+    assert summary['articles'] == manifest['records'] == 300
+    assert sum(summary['verdict_counts'].values()) == 300
+    assert summary['missing_shards'] == [] and summary['failed_shards'] == []
+
+
+def race_lease_break(monkeypatch, work_dir, newer_claim):
+    """Renew an expired lease between break_expired_lease's read and its rename"""
+    owner = batch.Lease(str(work_dir), 'shard-00000', 'slow', lease_seconds=-1)
+    assert owner.acquire()
+    owner.lease_seconds = 60
+    claimer = batch.Lease(str(work_dir), 'shard-00000', 'newer', lease_seconds=60)
+    real_rename = os.rename
+
+    def rename(src, dst):
+        monkeypatch.setattr(os, 'rename', real_rename)
+        assert owner.renew()
+        real_rename(src, dst)
+        if newer_claim:
+            assert claimer.acquire()
+
+    monkeypatch.setattr(os, 'rename', rename)
+    assert not batch.break_expired_lease(str(work_dir), 'shard-00000')
+    assert os.listdir(work_dir / 'leases') == ['shard-00000.lease']
+    return owner, claimer
+
+
+def test_renewed_lease_is_restored_after_a_lost_break(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'leases')
+    owner, _ = race_lease_break(monkeypatch, tmp_path, newer_claim=False)
+    assert owner.still_held()
+
+
+def test_restoring_a_renewed_lease_never_overwrites_a_newer_claim(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'leases')
+    owner, claimer = race_lease_break(monkeypatch, tmp_path, newer_claim=True)
+    assert claimer.still_held() and not owner.still_held()
+
+
+def test_poison_shard_is_marked_failed_after_max_attempts(tmp_path):
+    corpus = tmp_path / 'corpus.jsonl'
+    work_dir = tmp_path / 'work'
+    write_corpus(corpus, 300)
+    batch.shard_corpus(str(corpus), str(work_dir), shard_size=100)
+    (work_dir / 'shards' / 'shard-00002.jsonl').write_text('{not json\n')
+
+    run_workers(work_dir, 2, '--lease-seconds', '2', '--max-attempts', '2')
+
+    assert batch.shard_status(str(work_dir)) == {'pending': 0, 'leased': 0, 'done': 2, 'failed': 1}
+    failed = batch.read_json(str(work_dir / 'failed' / 'shard-00002.json'))
+    assert failed['attempts'] == 2
+    # Claims are logged per shard: a failed shard was claimed max_attempts + 1 times
+    assert len(os.listdir(work_dir / 'attempts' / 'shard-00002')) == 3
+    summary = batch.merge_results(str(work_dir))
+    assert summary['articles'] == 200
+    assert summary['failed_shards'] == ['shard-00002']
+    assert summary['missing_shards'] == ['shard-00002']
+
+
+def test_results_have_stable_schema_and_one_batch_per_date(tmp_path):
+    corpus = tmp_path / 'corpus.jsonl'
+    work_dir = tmp_path / 'work'
+    write_corpus(corpus, 300)
+    batch.shard_corpus(str(corpus), str(work_dir), shard_size=100)
+    batch.run_worker(str(work_dir), 'test')
+
+    files = batch.result_files(str(work_dir))
+    assert len(files) == 3
+    for path in files:
+        reader = pa.ipc.open_file(path)
+        assert reader.schema.equals(batch.RESULT_SCHEMA, check_metadata=True)
+        days = [reader.get_batch(i)['date'].unique().to_pylist() for i in range(reader.num_record_batches)]
+        assert all(len(day) == 1 for day in days)
+        assert [day[0] for day in days] == [date(2026, 10, 1), date(2026, 10, 2), date(2026, 10, 3)]
+
+    table = batch.load_result_columns(str(work_dir), ['verdict', 'score'])
+    assert table.column_names == ['verdict', 'score']
+    assert table.num_rows == 300
+
+
+def test_only_result_files_are_read(tmp_path):
+    (tmp_path / 'notes.csv').write_text('headline,text\n')
+    assert batch.result_files(str(tmp_path / 'notes.csv')) == []
+    assert batch.result_files(str(tmp_path)) == []
+
+    foreign = tmp_path / 'other.arrow'
+    with pa.OSFile(str(foreign), 'wb') as sink, pa.ipc.new_file(sink, pa.schema([('x', pa.int64())])) as writer:
+        writer.write_table(pa.table({'x': [1]}))
+    with pytest.raises(pa.ArrowInvalid):
+        batch.load_result_columns(str(tmp_path), ['score'])
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import app
+
+
+def write_upload(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+
+def run_job(input_path, file_format, timeout=10):
+    job = app.BulkScoringJob(input_path, file_format).start()
+    deadline = time.time() + timeout
+    while job.snapshot()['status'] == "running":
+        assert time.time() < deadline, "bulk job never finished"
+        time.sleep(0.01)
+    return job
+
+
+def test_malformed_jsonl_lines_are_skipped_not_fatal(tmp_path):
+    lines = [json.dumps({'headline': f"Headline {i}", 'text': "According to a study"}) for i in range(3)]
+    lines += ["{bad", json.dumps(["not", "an", "object"]), json.dumps({'headline': "No text"})]
+    job = run_job(write_upload(tmp_path, 'upload.jsonl', '\n'.join(lines) + '\n'), 'jsonl')
+
+    snapshot = job.snapshot()
+    assert snapshot['status'] == "done"
+    assert snapshot['rows_done'] == 3
+    assert snapshot['rows_skipped'] == 3
+    job.cleanup()
+
+
+def test_results_keep_source_rows_ids_and_full_headlines(tmp_path):
+    long_headline = "Breaking " * 20
+    lines = ["{bad", json.dumps({'id': "A", 'headline': long_headline, 'text': "x"}),
+             "", json.dumps({'id': "B", 'text': "y"})]
+    job = run_job(write_upload(tmp_path, 'upload.jsonl', '\n'.join(lines) + '\n'), 'jsonl')
+
+    results = pd.read_csv(job.output_path, dtype={'id': str}, keep_default_na=False)
+    assert results['row'].tolist() == [2, 4]
+    assert results['id'].tolist() == ["A", "B"]
+    assert results['headline'].tolist() == [long_headline, ""]
+    job.cleanup()
+
+    csv_upload = write_upload(tmp_path, 'upload.csv', "id,headline,text\nA,h1,x\nB,h2,y\n")
+    job = run_job(csv_upload, 'csv')
+    results = pd.read_csv(job.output_path, dtype={'id': str})
+    assert results['row'].tolist() == [1, 2]
+    assert results['id'].tolist() == ["A", "B"]
+    job.cleanup()
+
+
+def test_jsonl_with_no_text_fields_fails_like_csv(tmp_path):
+    jsonl_job = run_job(write_upload(tmp_path, 'upload.jsonl', json.dumps({'headline': "x"}) + '\n'), 'jsonl')
+    csv_job = run_job(write_upload(tmp_path, 'upload.csv', "headline\nx\n"), 'csv')
+
+    assert jsonl_job.snapshot()['status'] == "failed"
+    assert "text" in jsonl_job.snapshot()['error']
+    assert csv_job.snapshot()['status'] == "failed"
+    assert "text" in csv_job.snapshot()['error']
+    jsonl_job.cleanup()
+    csv_job.cleanup()
+
+
+def test_registry_sweep_removes_abandoned_job_files(tmp_path, monkeypatch):
+    input_path = write_upload(tmp_path, 'upload.csv', "headline,text\na,b\n")
+    job = run_job(input_path, 'csv')
+    fd, stray_path = tempfile.mkstemp(prefix="bulk_results_", suffix=".csv", dir=app.bulk_temp_dir())
+    os.close(fd)
+    old = time.time() - app.BULK_JOB_TTL_SECONDS - 10
+    os.utime(stray_path, (old, old))
+
+    registry = app.BulkJobRegistry()
+    registry.touch(job)
+    registry.sweep(force=True)
+    assert os.path.exists(job.output_path)
+    assert not os.path.exists(stray_path)
+
+    monkeypatch.setattr(app.time, 'time', lambda: old + 2 * app.BULK_JOB_TTL_SECONDS + 20)
+    registry.sweep(force=True)
+    assert job.removed
+    assert not os.path.exists(job.input_path)
+    assert not os.path.exists(job.output_path)
+
+
+def test_sweep_only_removes_temp_dirs_of_exited_processes():
+    exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                            capture_output=True, text=True, check=True)
+    dead_dir = app.bulk_temp_dir(int(exited.stdout))
+    live_dir = app.bulk_temp_dir(os.getppid())
+    upload_path = os.path.join(live_dir, 'bulk_upload_live.csv')
+    with open(upload_path, 'w') as f:
+        f.write("text\nx\n")
+    old = time.time() - app.BULK_JOB_TTL_SECONDS - 10
+    os.utime(upload_path, (old, old))
+
+    try:
+        app.BulkJobRegistry().sweep(force=True)
+        assert not os.path.exists(dead_dir)
+        # Another live server's long-running upload is left alone
+        assert os.path.exists(upload_path)
+    finally:
+        os.remove(upload_path)
+        try:
+            os.rmdir(live_dir)
+        except OSError:
+            pass
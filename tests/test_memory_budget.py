@@ -0,0 +1,58 @@
+import sys
+
+import pandas as pd
+
+import app
+
+
+def session_state(**overrides):
+    state = {
+        'url_fetched': None,
+        'bulk_job': None,
+        'bulk_download_ready': False,
+        'current_result': None,
+        'analysis_history': [],
+    }
+    state.update(overrides)
+    return state
+
+
+def test_estimate_size_counts_nested_containers_once():
+    assert app.estimate_size(None) == 0
+
+    shared = "x" * 10_000
+    nested = {'a': [shared, {'b': (shared,)}]}
+    size = app.estimate_size(nested)
+    assert sys.getsizeof(shared) < size < 2 * sys.getsizeof(shared)
+
+    frame = pd.DataFrame({'headline': ["a long headline"] * 1000})
+    assert app.estimate_size(frame) == int(frame.memory_usage(deep=True).sum())
+
+
+def test_eviction_order_stops_once_under_budget():
+    big = "y" * 50_000
+    state = session_state(
+        url_fetched={'text': big},
+        current_result={'text': big},
+        analysis_history=[{'text': big} for _ in range(8)],
+    )
+
+    # Dropping the fetched article alone is not enough; current result goes next
+    budget = app.estimate_size(state['analysis_history']) + 1000
+    components, evicted = app.evict_session_data(state, budget)
+
+    assert [name for name, _ in evicted] == ['url_fetched', 'current_result']
+    assert all(freed > 0 for _, freed in evicted)
+    assert state['url_fetched'] is None and state['current_result'] is None
+    assert len(state['analysis_history']) == 8
+    assert sum(components.values()) <= budget
+
+
+def test_history_is_trimmed_last_and_never_emptied():
+    big = "z" * 50_000
+    state = session_state(analysis_history=[{'text': big} for _ in range(20)])
+
+    _, evicted = app.evict_session_data(state, 0)
+
+    assert [name for name, _ in evicted] == ['analysis_history']
+    assert len(state['analysis_history']) == 5
@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import app
+
+
+def submit_with_timeout(queue, url, timeout=5):
+    """Submit from another thread so a deadlock fails the test instead of hanging it"""
+    job_ids = []
+    submitter = threading.Thread(target=lambda: job_ids.append(queue.submit(url)), daemon=True)
+    submitter.start()
+    submitter.join(timeout)
+    assert not submitter.is_alive(), f"submit({url!r}) deadlocked"
+    return job_ids[0]
+
+
+def wait_for_result(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status, result = queue.poll(job_id)
+        if status != "pending":
+            return status, result
+        time.sleep(0.01)
+    raise AssertionError("fetch never finished")
+
+
+def test_instantly_failing_urls_do_not_deadlock():
+    queue = app.UrlFetchQueue(max_workers=2)
+    # No scheme: requests raises MissingSchema before any network I/O
+    job_ids = [submit_with_timeout(queue, f"not-a-url-{i}") for i in range(50)]
+
+    for job_id in job_ids:
+        status, (headline, article_text, error) = wait_for_result(queue, job_id)
+        assert status == "done"
+        assert error
+        assert headline and article_text
+    # Done-callbacks run on the worker thread just after the result is set
+    deadline = time.time() + 5
+    while queue._in_flight and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue._in_flight == {}
+
+
+class ImmediateExecutor:
+    """Finishes every future before submit() returns - the worst case for callbacks"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def test_already_finished_fetch_does_not_deadlock():
+    queue = app.UrlFetchQueue(max_workers=1)
+    queue._executor = ImmediateExecutor()
+
+    job_id = submit_with_timeout(queue, "not-a-url")
+    status, (_, _, error) = queue.poll(job_id)
+    assert status == "done"
+    assert "not-a-url" in error
+    assert queue._in_flight == {}
+
+
+def test_identical_in_flight_urls_share_one_fetch(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch(url):
+        calls.append(url)
+        release.wait(5)
+        return "Headline", "Text", None
+
+    monkeypatch.setattr(app, "extract_article_from_url", slow_fetch)
+    queue = app.UrlFetchQueue(max_workers=2)
+    first = queue.submit("https://example.com/a")
+    second = queue.submit("https://example.com/a ")
+    assert queue.poll(first) == ("pending", None)
+
+    release.set()
+    assert wait_for_result(queue, first) == ("done", ("Headline", "Text", None))
+    assert wait_for_result(queue, second) == ("done", ("Headline", "Text", None))
+    assert calls == ["https://example.com/a"]
+    assert queue.poll(first) == ("missing", None)